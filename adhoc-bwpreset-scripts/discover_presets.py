@@ -8,10 +8,16 @@ Metadata is inferred from directory structure:
                 device      preset name (filename stem)
 """
 
+import os
+from operator import attrgetter
 from pathlib import Path
 from dataclasses import dataclass
 
 
+# Device folder follows the first Presets component of a preset's path
+_PRESETS_SEGMENT = f"{os.sep}Presets{os.sep}"
+
+
 @dataclass
 class BitwigPreset:
     device: str
@@ -24,6 +30,32 @@ class BitwigPreset:
         return self.size / 1024
 
 
+def _walk_bwpreset(root: str):
+    """Yield an os.DirEntry for each .bwpreset under root, in Path.rglob order.
+
+    Walks with os.scandir so directory entries are filtered by name without
+    building a Path for every file in the tree. Callers stat only the entries
+    they keep; DirEntry caches the result.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    for entry in entries:
+        if entry.name.endswith('.bwpreset'):
+            yield entry
+
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            yield from _walk_bwpreset(entry.path)
+
+
 def find_presets(search_paths: list[Path], device_filter: str | None = None) -> list[BitwigPreset]:
     """Find all .bwpreset files, extracting metadata from path structure."""
     presets = []
@@ -32,25 +64,26 @@ def find_presets(search_paths: list[Path], device_filter: str | None = None) ->
         if not base_path.exists():
             continue
 
-        for preset_file in base_path.rglob("*.bwpreset"):
-            parts = preset_file.parts
-            try:
-                presets_idx = parts.index("Presets")
-                device = parts[presets_idx + 1]
-            except (ValueError, IndexError):
+        for entry in _walk_bwpreset(os.fspath(base_path)):
+            path = entry.path
+            presets_idx = path.find(_PRESETS_SEGMENT)
+            if presets_idx != -1:
+                device = path[presets_idx + len(_PRESETS_SEGMENT):].split(os.sep, 1)[0]
+            else:
                 device = "Unknown"
 
             if device_filter and device_filter.lower() not in device.lower():
                 continue
 
+            preset_file = Path(path)
             presets.append(BitwigPreset(
                 device=device,
                 name=preset_file.stem,
                 path=preset_file,
-                size=preset_file.stat().st_size
+                size=entry.stat().st_size,
             ))
 
-    return sorted(presets, key=lambda p: (p.device, p.name))
+    return sorted(presets, key=attrgetter('device', 'name'))
 
 
 def main():
@@ -6,17 +6,57 @@ Assembles section-based ABC snippets into complete ABC files,
 validates bar counts, injects keyswitches and CC automation,
 then calls abc2midi to generate MIDI.
 
+Install for the generator scripts with: pip install -e adhoc-midi-scripts
+
 IMPORTANT: abc2midi treats blank lines as end-of-tune markers.
 Never insert blank lines between header and music, or between
 music sections. Use comments (% ...) for visual separation instead.
 """
 
+import os
 import re
 import subprocess
+import sys
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass
 
 
+_UNIT_RE = re.compile(r'1/(\d+)')
+# Echo full ABC content in progress reports only when HALCYON_VERBOSE is set
+_VERBOSE = bool(os.environ.get('HALCYON_VERBOSE'))
+
+# Header fields and %-directives/comments, with their newline; everything else is music
+_STRIP_RE = re.compile(r'(?m)^(?:%.*|[XTMLKQ]:.*)(?:\n|$)')
+
+# count_abc_units scanner contexts
+_NORMAL, _IN_BRACKET, _IN_DIRECTIVE = range(3)
+# Duration phases of the note being scanned: none, letter/octave, numerator, slash, denominator
+_NO_NOTE, _AFTER_NOTE, _AFTER_NOTE_NUM, _AFTER_SLASH, _AFTER_DENOM = range(5)
+# Byte classes; everything from _PERCENT up changes scanner context
+_OTHER, _LETTER, _DIGIT, _SLASH, _OCTAVE, _PERCENT, _OPEN, _CLOSE, _NEWLINE = range(9)
+
+
+def _build_class_table() -> bytes:
+    """Map every byte value to its scanner class, for use with bytes.translate."""
+    table = bytearray([_OTHER]) * 256
+    for byte in b'ABCDEFGabcdefgz':
+        table[byte] = _LETTER
+    for byte in b'0123456789':
+        table[byte] = _DIGIT
+    table[ord('/')] = _SLASH
+    table[ord(',')] = _OCTAVE
+    table[ord("'")] = _OCTAVE
+    table[ord('%')] = _PERCENT
+    table[ord('[')] = _OPEN
+    table[ord(']')] = _CLOSE
+    table[ord('\n')] = _NEWLINE
+    return bytes(table)
+
+
+_CLASS_TABLE = _build_class_table()
+
+
 @dataclass
 class ABCHeader:
     title: str
@@ -47,13 +87,17 @@ class CCAutomation:
     values: list[tuple[float, int]]  # (beat, value) pairs
 
 
+@lru_cache(maxsize=32)
 def units_per_bar(meter: str, unit_length: str) -> int:
-    """Calculate how many unit lengths fit in one bar."""
+    """Calculate how many unit lengths fit in one bar.
+
+    Cached: a song uses a handful of meter/unit pairs across all its sections.
+    """
     # Parse meter like "4/4" or "3/4"
     num, denom = map(int, meter.split('/'))
 
     # Parse unit length like "1/8" or "1/4"
-    match = re.match(r'1/(\d+)', unit_length)
+    match = _UNIT_RE.match(unit_length)
     if not match:
         return 8  # default
     unit_denom = int(match.group(1))
@@ -62,6 +106,18 @@ def units_per_bar(meter: str, unit_length: str) -> int:
     return (num * unit_denom) // denom
 
 
+def _note_duration(phase: int, num: int | None, denom: int) -> float:
+    """Duration of a scanned note given the phase it ended in."""
+    if phase == _AFTER_DENOM:
+        # e.g., C3/2 = 1.5, C/2 = 0.5
+        return num / denom if num is not None else 1.0 / denom
+    if num is not None:
+        # e.g., C2 = 2
+        return num
+    # e.g., C = 1
+    return 1.0
+
+
 def count_abc_units(abc: str) -> float:
     """
     Count the total duration units in an ABC snippet.
@@ -73,44 +129,97 @@ def count_abc_units(abc: str) -> float:
     - C3/2 = 1.5 units
     - z = 1 unit rest
     - z2 = 2 unit rest
+
+    Chord symbols ("Cm") are dropped first with one split/join over the
+    encoded bytes. The rest is a single pass over byte classes from
+    bytes.translate: %% directives and chord brackets ([CEG]) are skipped
+    inline. Like the old regex pipeline, skipped spans join the text around
+    them and a bracket left unclosed on its line is counted as plain notes.
     """
-    total = 0.0
+    # Pairs of quotes delimit chord symbols; an unmatched last quote is kept
+    parts = abc.encode().split(b'"')
+    if len(parts) % 2:
+        buf = b''.join(parts[::2])
+    else:
+        buf = b''.join(parts[:-1:2]) + b'"' + parts[-1]
+    classes = buf.translate(_CLASS_TABLE)
 
-    # Remove chord symbols, bar lines, and other non-note content
-    clean = re.sub(r'"[^"]*"', '', abc)  # Remove chord symbols
-    clean = re.sub(r'\|+', ' ', clean)   # Remove bar lines
-    clean = re.sub(r'%%.*', '', clean)   # Remove directives
-    clean = re.sub(r'\[.*?\]', '', clean)  # Remove chord brackets (count separately if needed)
-
-    # Pattern for notes: optional accidental, note letter, optional octave, optional duration
-    note_pattern = re.compile(r"([_^=]?)([A-Ga-gz])([,']*)(\d*)(/?)(\d*)")
-
-    for match in note_pattern.finditer(clean):
-        # accidental, note, octave, num, slash, denom
-        num = match.group(4)
-        slash = match.group(5)
-        denom = match.group(6)
-
-        if num and slash and denom:
-            # e.g., C3/2 = 1.5
-            duration = int(num) / int(denom)
-        elif slash and denom:
-            # e.g., C/2 = 0.5
-            duration = 1.0 / int(denom)
-        elif num:
-            # e.g., C2 = 2
-            duration = int(num)
-        else:
-            # e.g., C = 1
-            duration = 1.0
-
-        total += duration
+    total = 0.0
+    context = _NORMAL
+    phase = _NO_NOTE
+    num = None
+    denom = 0
+    saved = None  # scanner state at the last '[', restored when it closes
+    prev = _OTHER  # class of the previous byte
+
+    for i, cls in enumerate(classes):
+        if context == _IN_DIRECTIVE:
+            if cls == _NEWLINE:
+                context = _NORMAL
+                prev = cls
+            continue
+
+        if cls >= _PERCENT:
+            if cls == _PERCENT:
+                if prev == _PERCENT:
+                    # Directive runs to end of line and also leaves any open bracket unclosed
+                    context = _IN_DIRECTIVE
+                    saved = None
+                    continue
+            elif context == _IN_BRACKET:
+                if cls == _CLOSE:
+                    total, phase, num, denom = saved
+                    saved = None
+                    context = _NORMAL
+                    prev = cls
+                    continue
+                if cls == _NEWLINE:
+                    # Unclosed bracket: keep what was counted inside it
+                    saved = None
+                    context = _NORMAL
+            elif cls == _OPEN:
+                saved = (total, phase, num, denom)
+                context = _IN_BRACKET
+        prev = cls
+
+        if cls == _LETTER:
+            if phase:
+                total += _note_duration(phase, num, denom)
+            phase = _AFTER_NOTE
+            num = None
+        elif cls == _DIGIT:
+            digit = buf[i] - 48
+            if phase == _AFTER_NOTE:
+                phase = _AFTER_NOTE_NUM
+                num = digit
+            elif phase == _AFTER_NOTE_NUM:
+                num = num * 10 + digit
+            elif phase == _AFTER_SLASH:
+                phase = _AFTER_DENOM
+                denom = digit
+            elif phase == _AFTER_DENOM:
+                denom = denom * 10 + digit
+        elif cls == _SLASH and (phase == _AFTER_NOTE or phase == _AFTER_NOTE_NUM):
+            phase = _AFTER_SLASH
+        elif cls == _OCTAVE and phase == _AFTER_NOTE:
+            pass  # octave marks
+        elif phase:
+            total += _note_duration(phase, num, denom)
+            phase = _NO_NOTE
+
+    if phase:
+        total += _note_duration(phase, num, denom)
 
     return total
 
 
+@lru_cache(maxsize=256)
 def validate_bars(abc: str, expected_bars: int, meter: str = "4/4", unit_length: str = "1/8") -> tuple[bool, str]:
-    """Validate that ABC snippet has the expected number of bars."""
+    """Validate that ABC snippet has the expected number of bars.
+
+    Cached: the result depends only on the arguments, and batch runs validate
+    the same sections and generated parts repeatedly.
+    """
     upb = units_per_bar(meter, unit_length)
     actual_units = count_abc_units(abc)
     actual_bars = actual_units / upb
@@ -123,27 +232,23 @@ def validate_bars(abc: str, expected_bars: int, meter: str = "4/4", unit_length:
 
 def generate_abc_header(header: ABCHeader, index: int = 1) -> str:
     """Generate ABC file header."""
-    lines = [
+    # Only include tempo if specified (otherwise set via DAW/OSC)
+    tempo = (f"Q:1/4={header.tempo}",) if header.tempo is not None else ()
+    lines = (
         f"X:{index}",
         f"T:{header.title}",
         f"M:{header.meter}",
         f"L:{header.unit_length}",
-    ]
-    # Only include tempo if specified (otherwise set via DAW/OSC)
-    if header.tempo is not None:
-        lines.append(f"Q:1/4={header.tempo}")
-    lines.extend([
+        *tempo,
         f"K:{header.key}",
         f"%%MIDI program {header.midi_program}",
         f"%%MIDI channel {header.midi_channel}",
-    ])
+    )
     return '\n'.join(lines)
 
 
-def inject_keyswitch(note: int, beat: float, unit_length: str = "1/8") -> str:
-    """Generate ABC for a keyswitch note at a specific beat."""
-    # Keyswitches are very short notes
-    # Convert MIDI note to ABC notation
+def _midi_note_to_abc(note: int) -> str:
+    """Convert a MIDI note number to an ABC pitch."""
     # MIDI 60 = C, 61 = ^C, etc.
     octave = (note // 12) - 5  # MIDI 60 is middle C (C in ABC)
     pitch_class = note % 12
@@ -159,6 +264,18 @@ def inject_keyswitch(note: int, beat: float, unit_length: str = "1/8") -> str:
         if octave > 1:
             pitch += "'" * (octave - 1)
 
+    return pitch
+
+
+# ABC pitch for every MIDI note, built once at import
+_NOTE_TO_ABC = tuple(_midi_note_to_abc(note) for note in range(128))
+
+
+def inject_keyswitch(note: int, beat: float, unit_length: str = "1/8") -> str:
+    """Generate ABC for a keyswitch note at a specific beat."""
+    # Keyswitches are very short notes
+    pitch = _NOTE_TO_ABC[note] if 0 <= note < 128 else _midi_note_to_abc(note)
+
     # Very short duration (1/8 of unit length)
     return f"[{pitch}/8]z7/8"
 
@@ -207,25 +324,39 @@ def assemble_instrument(
     return '\n'.join(abc_content)
 
 
-def abc_to_midi(abc_path: Path, midi_path: Path | None = None, strip_tempo: bool = True) -> Path:
-    """Convert ABC file to MIDI using abc2midi.
+def abc_to_midi_async(abc_path: Path, midi_path: Path | None = None) -> subprocess.Popen:
+    """Start abc2midi on an ABC file and return immediately.
+
+    Pass the handle to wait_abc_to_midi to collect the result, so several
+    conversions can run at once.
 
     Args:
         abc_path: Path to ABC file
         midi_path: Output path (default: same name with .mid extension)
-        strip_tempo: Remove tempo meta messages (set tempo via DAW/OSC instead)
     """
     if midi_path is None:
         midi_path = abc_path.with_suffix('.mid')
 
-    result = subprocess.run(
+    return subprocess.Popen(
         ['abc2midi', str(abc_path), '-o', str(midi_path)],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
     )
 
-    if result.returncode != 0:
-        raise RuntimeError(f"abc2midi failed: {result.stderr}")
+
+def wait_abc_to_midi(proc: subprocess.Popen, strip_tempo: bool = True) -> Path:
+    """Wait for an abc_to_midi_async conversion and return the MIDI path.
+
+    Args:
+        proc: Handle returned by abc_to_midi_async
+        strip_tempo: Remove tempo meta messages (set tempo via DAW/OSC instead)
+    """
+    _, stderr = proc.communicate()
+    midi_path = Path(proc.args[-1])
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"abc2midi failed: {stderr}")
 
     # Strip tempo messages if requested (let DAW control tempo)
     if strip_tempo:
@@ -242,6 +373,88 @@ def abc_to_midi(abc_path: Path, midi_path: Path | None = None, strip_tempo: bool
     return midi_path
 
 
+def abc_to_midi(abc_path: Path, midi_path: Path | None = None, strip_tempo: bool = True) -> Path:
+    """Convert ABC file to MIDI using abc2midi.
+
+    Args:
+        abc_path: Path to ABC file
+        midi_path: Output path (default: same name with .mid extension)
+        strip_tempo: Remove tempo meta messages (set tempo via DAW/OSC instead)
+    """
+    return wait_abc_to_midi(abc_to_midi_async(abc_path, midi_path), strip_tempo)
+
+
+def write_ascii(path: Path, s: str) -> None:
+    """Write an ASCII string to path with a single os.write (no text-mode stack)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, s.encode('ascii'))
+    finally:
+        os.close(fd)
+
+
+def write_abc(
+    name: str,
+    abc_content: str,
+    abc_path: Path,
+    expected_bars: int | None = 8,
+    meter: str = "4/4",
+    unit_length: str = "1/8",
+) -> bool:
+    """Validate bar count, then save the ABC to abc_path.
+
+    Pass expected_bars=None to skip validation. Validation is a development
+    check on hand-written content, so it is also skipped under python -O.
+    Prints progress (with the ABC itself if HALCYON_VERBOSE is set); returns
+    False (without writing) if validation fails.
+    """
+    if __debug__ and expected_bars is not None:
+        # Extract just the music lines (skip headers and directives)
+        music = _STRIP_RE.sub('', abc_content).replace('\n', ' ').strip()
+
+        valid, error = validate_bars(music, expected_bars, meter, unit_length)
+        if not valid:
+            print(f"{name} validation FAILED: {error}")
+            return False
+
+    write_ascii(abc_path, abc_content)
+    if __debug__ and expected_bars is not None:
+        status = f"{name}: {expected_bars} bars validated"
+    else:
+        status = f"{name}: written to {abc_path}"
+    # One write for the whole report instead of a print per line
+    if _VERBOSE:
+        sys.stdout.write(f"{status}\n{abc_content}\n\n")
+    else:
+        sys.stdout.write(f"{status}\n")
+    return True
+
+
+def emit_abc_and_midi(
+    name: str,
+    abc_content: str,
+    abc_path: Path,
+    expected_bars: int | None = 8,
+    meter: str = "4/4",
+    unit_length: str = "1/8",
+) -> bool:
+    """Validate bar count, then save the ABC to abc_path and convert it to MIDI.
+
+    Prints progress; returns False if validation or MIDI conversion fails.
+    """
+    if not write_abc(name, abc_content, abc_path, expected_bars, meter, unit_length):
+        return False
+
+    try:
+        midi_path = abc_to_midi(abc_path)
+        print(f"  -> {midi_path}")
+    except Exception as e:
+        print(f"  MIDI error: {e}")
+        return False
+
+    return True
+
+
 def main():
     """Demo: assemble a simple song."""
 
@@ -0,0 +1,11 @@
+"""
+Shared ABC directive strings for the generator scripts.
+
+CC1 maps a mod wheel value to its "%%MIDI control 1 <value>" directive. The
+strings are interned so every script references the same objects.
+"""
+
+import sys
+
+# CC1 = mod wheel (vibrato/expression) values used by the generators
+CC1 = {v: sys.intern(f"%%MIDI control 1 {v}") for v in (0, 20, 30, 40, 45, 50, 55, 60, 65, 70)}
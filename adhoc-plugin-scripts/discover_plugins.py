@@ -5,13 +5,25 @@ Discover audio plugins and instruments on macOS.
 Scans standard locations for VST3, CLAP, AU, and vendor-specific content.
 """
 
+import os
 from pathlib import Path
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import json
 import subprocess
 import re
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # also parses bytes, just slower
 
-@dataclass
+# auval -a output line, e.g.: aufx dely Avid  -  Avid Delay
+_AUVAL_RE = re.compile(r"\s*\w{4}\s+\w{4}\s+\w{4}\s+-\s+(.+)")
+
+
+@dataclass(slots=True)
 class Plugin:
     name: str
     format: str
@@ -19,6 +31,20 @@ class Plugin:
     vendor: str | None = None
 
 
+def _scan_ext(loc: Path, ext: str, fmt: str, vendor: str | None = None) -> list[Plugin]:
+    """List entries of loc ending in ext as plugins, like loc.glob(f"*{ext}").
+
+    Names are filtered on os.scandir entries, so Path objects are only built
+    for matches. A missing or unreadable loc yields nothing.
+    """
+    try:
+        with os.scandir(loc) as it:
+            paths = [Path(entry.path) for entry in it if entry.name.endswith(ext)]
+    except OSError:
+        return []
+    return [Plugin(name=path.stem, format=fmt, path=path, vendor=vendor) for path in paths]
+
+
 def find_vst2_plugins() -> list[Plugin]:
     """Find VST2 plugins in standard locations."""
     locations = [
@@ -27,13 +53,7 @@ def find_vst2_plugins() -> list[Plugin]:
     ]
     plugins = []
     for loc in locations:
-        if loc.exists():
-            for bundle in loc.glob("*.vst"):
-                plugins.append(Plugin(
-                    name=bundle.stem,
-                    format="VST2",
-                    path=bundle,
-                ))
+        plugins.extend(_scan_ext(loc, ".vst", "VST2"))
     return plugins
 
 
@@ -45,13 +65,7 @@ def find_vst3_plugins() -> list[Plugin]:
     ]
     plugins = []
     for loc in locations:
-        if loc.exists():
-            for bundle in loc.glob("*.vst3"):
-                plugins.append(Plugin(
-                    name=bundle.stem,
-                    format="VST3",
-                    path=bundle,
-                ))
+        plugins.extend(_scan_ext(loc, ".vst3", "VST3"))
     return plugins
 
 
@@ -63,13 +77,7 @@ def find_clap_plugins() -> list[Plugin]:
     ]
     plugins = []
     for loc in locations:
-        if loc.exists():
-            for bundle in loc.glob("*.clap"):
-                plugins.append(Plugin(
-                    name=bundle.stem,
-                    format="CLAP",
-                    path=bundle,
-                ))
+        plugins.extend(_scan_ext(loc, ".clap", "CLAP"))
     return plugins
 
 
@@ -81,16 +89,82 @@ def find_au_plugins() -> list[Plugin]:
     ]
     plugins = []
     for loc in locations:
-        if loc.exists():
-            for bundle in loc.glob("*.component"):
-                plugins.append(Plugin(
-                    name=bundle.stem,
-                    format="AU",
-                    path=bundle,
-                ))
+        plugins.extend(_scan_ext(loc, ".component", "AU"))
     return plugins
 
 
+def _walk_kontakt_dir(path: str, want_nicnt: bool, want_nki: bool):
+    """Scan one directory level of a Kontakt tree and recurse.
+
+    Yields (lib_dir, "nicnt") for every .nicnt while want_nicnt is set, and
+    returns whether an .nki was seen while want_nki was set.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return False
+
+    has_nicnt = False
+    found_nki = False
+    for entry in entries:
+        if want_nicnt and entry.name.endswith(".nicnt"):
+            has_nicnt = True
+            yield Path(path), "nicnt"
+        elif want_nki and entry.name.endswith(".nki"):
+            found_nki = True
+
+    # A .nicnt marks a library root, so nothing below it is another library
+    want_nicnt = want_nicnt and not has_nicnt
+    want_nki = want_nki and not found_nki
+
+    for entry in entries:
+        if not (want_nicnt or want_nki):
+            break
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir and (yield from _walk_kontakt_dir(entry.path, want_nicnt, want_nki)):
+            found_nki = True
+            want_nki = False
+
+    return found_nki
+
+
+def _walk_kontakt(root: Path, nki_libraries: bool):
+    """Yield (lib_dir, kind) for Kontakt libraries under root in a single walk.
+
+    kind "nicnt": directory holding a .nicnt (Player-compatible library).
+    kind "nki": top-level directory of root with an .nki anywhere inside,
+    reported only when nki_libraries is set.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    has_nicnt = False
+    for entry in entries:
+        if entry.name.endswith(".nicnt"):
+            has_nicnt = True
+            yield root, "nicnt"
+
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            # Symlinked library folders are only checked for instruments
+            is_linked_dir = nki_libraries and not is_dir and entry.is_dir()
+        except OSError:
+            continue
+        if not (is_dir or is_linked_dir):
+            continue
+        want_nicnt = is_dir and not has_nicnt
+        if (yield from _walk_kontakt_dir(entry.path, want_nicnt, nki_libraries)):
+            yield Path(entry.path), "nki"
+
+
 def find_kontakt_libraries() -> list[Plugin]:
     """Find Kontakt libraries by scanning for .nicnt files and known locations."""
     # Standard NI locations + external drives
@@ -100,38 +174,31 @@ def find_kontakt_libraries() -> list[Plugin]:
         Path.home() / "Documents/Native Instruments",
         Path("/Volumes/External/kontakt_libraries"),  # External drive
     ]
+    locations = [loc for loc in locations if loc.exists()]
     libraries = []
     seen_names: set[str] = set()
 
-    for loc in locations:
-        if not loc.exists():
-            continue
-
-        # Find by .nicnt (Player-compatible libraries)
-        for nicnt in loc.rglob("*.nicnt"):
-            lib_dir = nicnt.parent
-            if lib_dir.name not in seen_names:
-                seen_names.add(lib_dir.name)
-                libraries.append(Plugin(
-                    name=lib_dir.name,
-                    format="Kontakt",
-                    path=lib_dir,
-                    vendor="Native Instruments",
-                ))
-
-        # Also scan top-level dirs that contain Instruments/*.nki
-        if loc.name == "kontakt_libraries" or loc == Path("/Users/Shared"):
-            for subdir in loc.iterdir():
-                if not subdir.is_dir():
-                    continue
-                # Check for .nki files anywhere in the library
-                nki_files = list(subdir.rglob("*.nki"))
-                if nki_files and subdir.name not in seen_names:
-                    seen_names.add(subdir.name)
+    # Walk the independent roots concurrently; results are consumed in order below.
+    # Top-level dirs that contain Instruments/*.nki are also libraries in these roots.
+    with ThreadPoolExecutor(max_workers=len(locations) or 1) as executor:
+        scans = [
+            executor.submit(list, _walk_kontakt(
+                loc, loc.name == "kontakt_libraries" or loc == Path("/Users/Shared")))
+            for loc in locations
+        ]
+
+    for scan in scans:
+        hits = scan.result()
+        # Libraries found by .nicnt take precedence over bare .nki folders
+        for kind, vendor in (("nicnt", "Native Instruments"), ("nki", None)):
+            for lib_dir, hit_kind in hits:
+                if hit_kind == kind and lib_dir.name not in seen_names:
+                    seen_names.add(lib_dir.name)
                     libraries.append(Plugin(
-                        name=subdir.name,
+                        name=lib_dir.name,
                         format="Kontakt",
-                        path=subdir,
+                        path=lib_dir,
+                        vendor=vendor,
                     ))
 
     return libraries
@@ -139,15 +206,13 @@ def find_kontakt_libraries() -> list[Plugin]:
 
 def find_ni_registered_products() -> list[Plugin]:
     """Find NI products from installed_products JSON registry."""
-    import json
-
     registry_dir = Path("/Users/Shared/Native Instruments/installed_products")
     products = []
 
     if registry_dir.exists():
         for json_file in registry_dir.glob("*.json"):
             try:
-                data = json.loads(json_file.read_text())
+                data = _json_loads(json_file.read_bytes())
                 name = data.get("name", json_file.stem)
                 products.append(Plugin(
                     name=name,
@@ -164,31 +229,13 @@ def find_ni_registered_products() -> list[Plugin]:
 def find_mtron_patches() -> list[Plugin]:
     """Find M-Tron Pro IV patches."""
     patches_dir = Path("/Library/Application Support/GForce/M-Tron Pro IV/Patches")
-    patches = []
-    if patches_dir.exists():
-        for xml_file in patches_dir.glob("*.xml"):
-            patches.append(Plugin(
-                name=xml_file.stem,
-                format="M-Tron Patch",
-                path=xml_file,
-                vendor="GForce",
-            ))
-    return patches
+    return _scan_ext(patches_dir, ".xml", "M-Tron Patch", vendor="GForce")
 
 
 def find_mtron_expansions() -> list[Plugin]:
     """Find M-Tron Pro expansion packs (.cpt2 files)."""
     expansion_dir = Path("/Volumes/External/M-Tron Pro Library")
-    expansions = []
-    if expansion_dir.exists():
-        for cpt2_file in expansion_dir.glob("*.cpt2"):
-            expansions.append(Plugin(
-                name=cpt2_file.stem,
-                format="M-Tron Expansion",
-                path=cpt2_file,
-                vendor="GForce",
-            ))
-    return expansions
+    return _scan_ext(expansion_dir, ".cpt2", "M-Tron Expansion", vendor="GForce")
 
 
 def list_au_via_auval() -> list[str]:
@@ -200,13 +247,11 @@ def list_au_via_auval() -> list[str]:
             text=True,
             timeout=30,
         )
-        # Parse output like: aufx dely Avid  -  Avid Delay
-        aus = []
-        for line in result.stdout.splitlines():
-            match = re.match(r"\s*\w{4}\s+\w{4}\s+\w{4}\s+-\s+(.+)", line)
-            if match:
-                aus.append(match.group(1).strip())
-        return aus
+        return [
+            match.group(1).strip()
+            for line in result.stdout.splitlines()
+            if (match := _AUVAL_RE.match(line))
+        ]
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return []
 
@@ -216,29 +261,24 @@ def main():
 
     format_filter = sys.argv[1].upper() if len(sys.argv) > 1 else None
 
-    all_plugins = []
-
-    if not format_filter or format_filter == "VST2":
-        all_plugins.extend(find_vst2_plugins())
-
-    if not format_filter or format_filter == "VST3":
-        all_plugins.extend(find_vst3_plugins())
-
-    if not format_filter or format_filter == "CLAP":
-        all_plugins.extend(find_clap_plugins())
-
-    if not format_filter or format_filter == "AU":
-        all_plugins.extend(find_au_plugins())
-
-    if not format_filter or format_filter == "KONTAKT":
-        all_plugins.extend(find_kontakt_libraries())
-
-    if not format_filter or format_filter == "NI":
-        all_plugins.extend(find_ni_registered_products())
+    scanners = [
+        ("VST2", find_vst2_plugins),
+        ("VST3", find_vst3_plugins),
+        ("CLAP", find_clap_plugins),
+        ("AU", find_au_plugins),
+        ("KONTAKT", find_kontakt_libraries),
+        ("NI", find_ni_registered_products),
+        ("MTRON", find_mtron_patches),
+        ("MTRON", find_mtron_expansions),
+    ]
+    tasks = [scan for fmt, scan in scanners if not format_filter or format_filter == fmt]
 
-    if not format_filter or format_filter == "MTRON":
-        all_plugins.extend(find_mtron_patches())
-        all_plugins.extend(find_mtron_expansions())
+    # Each scan walks its own directory trees, so run them concurrently to overlap disk latency
+    all_plugins = []
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(scan) for scan in tasks]
+        for future in futures:
+            all_plugins.extend(future.result())
 
     # Group by format
     by_format: dict[str, list[Plugin]] = {}
@@ -6,6 +6,7 @@ Patches are plain XML with a <metadata> element containing all info.
 """
 
 import xml.etree.ElementTree as ET
+from operator import attrgetter
 from pathlib import Path
 from dataclasses import dataclass, field
 
@@ -13,7 +14,7 @@ from dataclasses import dataclass, field
 PATCHES_DIR = Path("/Library/Application Support/GForce/M-Tron Pro IV/Patches")
 
 
-@dataclass
+@dataclass(slots=True)
 class MTronPatch:
     path: Path
     name: str
@@ -25,12 +26,25 @@ class MTronPatch:
     cpt: str | None = None  # Reference to .cpt2 sample file
 
 
+def _find_metadata(filepath: Path) -> ET.Element | None:
+    """Return the first <metadata> element below the root, parsing only up to it.
+
+    Attributes are complete on the start event, so the rest of the patch
+    (sample maps, modulation, etc.) is never parsed or kept in memory.
+    """
+    with open(filepath, 'rb') as f:
+        events = ET.iterparse(f, events=('start',))
+        next(events, None)  # root element; .//metadata only matches below it
+        for _, elem in events:
+            if elem.tag == 'metadata':
+                return elem
+    return None
+
+
 def parse_patch(filepath: Path) -> MTronPatch | None:
     """Parse an M-Tron patch XML file."""
     try:
-        tree = ET.parse(filepath)
-        meta = tree.find('.//metadata')
-
+        meta = _find_metadata(filepath)
         if meta is None:
             return None
 
@@ -104,7 +118,7 @@ def main():
 
         for category, cat_patches in sorted(by_category.items()):
             print(f"\n  [{category}]")
-            for p in sorted(cat_patches, key=lambda x: x.name):
+            for p in sorted(cat_patches, key=attrgetter('name')):
                 types_str = f" ({', '.join(p.types)})" if p.types else ""
                 print(f"    {p.name}{types_str}")
 
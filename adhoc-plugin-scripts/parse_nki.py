@@ -5,12 +5,40 @@ Parse NKI (Kontakt Instrument) files to extract metadata.
 Based on reverse-engineered format documentation.
 """
 
+import mmap
+import os
 import struct
 import re
 from pathlib import Path
 from dataclasses import dataclass
 
 
+# Metadata strings start before 0x600; the longest accepted one runs 4 + 300*2 bytes on
+_SCAN_LIMIT = 0x600 + 4 + 300 * 2
+# Low bytes accepted in a string: printable ASCII/Latin-1 plus tab, newline, cr
+_ALLOWED_LOW_BYTES = bytes(range(0x20, 0x100)) + b'\t\n\r'
+# Zero-width match at every offset whose little-endian uint32 is a plausible string length (2-300)
+_LENGTH_PREFIX_RE = re.compile(rb'(?=(?:[\x02-\xff]\x00|[\x00-\x2c]\x01)\x00\x00)')
+
+# Whole-string shapes decided up front: a version number, or a short code
+# like P79/W06 that is never metadata. One match covers both; see m.lastgroup.
+_CLASSIFY_RE = re.compile(r'^(?:(?P<version>\d+\.\d+\.\d+(?:\.\d+)?)|(?P<skip_code>[A-Z]\d{2}))$')
+
+# Keyword tests for classify_string, each compiled to one alternation so a
+# string is scanned once per group instead of once per keyword
+AUTHOR_KEYWORDS = ['Audio', 'Sound', 'Instruments', 'Productions', 'Music',
+                   'Studios', 'Labs', 'Samples', 'Orchestra']
+CATEGORY_KEYWORDS = ['Strings', 'Bass', 'Piano', 'Synth', 'Pad', 'Lead',
+                     'Brass', 'Woodwind', 'Percussion', 'Drums', 'Guitar',
+                     'Vocal', 'Choir', 'Orchestral', 'Ethnic', 'World']
+# Technical/internal strings to skip
+SKIP_PATTERNS = ['Kontakt', 'KontaktInstrument', '@', 'DSIN', 'hsin', '4KIN']
+
+_AUTHOR_RE = re.compile('|'.join(map(re.escape, AUTHOR_KEYWORDS)))
+_CATEGORY_RE = re.compile('|'.join(map(re.escape, CATEGORY_KEYWORDS)))
+_SKIP_RE = re.compile('|'.join(map(re.escape, SKIP_PATTERNS)))
+
+
 @dataclass
 class NKIMetadata:
     path: Path
@@ -27,7 +55,7 @@ def read_utf16le_string(data: bytes, offset: int) -> tuple[str | None, int]:
     if offset + 4 > len(data):
         return None, 0
 
-    length = struct.unpack('<I', data[offset:offset+4])[0]
+    length = struct.unpack_from('<I', data, offset)[0]
 
     # Sanity check - reasonable string length
     if length > 300 or length < 2:
@@ -40,16 +68,13 @@ def read_utf16le_string(data: bytes, offset: int) -> tuple[str | None, int]:
     raw = data[offset+4:end]
 
     # Strict validation: high bytes must be 0 for printable ASCII range
-    # This catches garbage data that looks like valid length prefixes
-    for i in range(0, len(raw), 2):
-        if i + 1 >= len(raw):
-            break
-        low, high = raw[i], raw[i+1]
-        # Must be printable ASCII (0x20-0x7E) or common extended (\, :, etc)
-        if high != 0:
-            return None, 0
-        if low < 0x20 and low not in (0x09, 0x0A, 0x0D):  # tab, newline, cr
-            return None, 0
+    # This catches garbage data that looks like valid length prefixes.
+    # Both checks run over strided byte slices in C rather than per character.
+    if raw[1::2].count(0) != length:
+        return None, 0
+    # Low bytes must be printable (0x20+) or tab/newline/cr; anything left after deleting those fails
+    if raw[0::2].translate(None, _ALLOWED_LOW_BYTES):
+        return None, 0
 
     try:
         decoded = raw.decode('utf-16-le')
@@ -62,39 +87,35 @@ def read_utf16le_string(data: bytes, offset: int) -> tuple[str | None, int]:
         return None, 0
 
 
-def find_strings_in_region(data: bytes, start: int, end: int) -> list[tuple[int, str]]:
-    """Scan a region for valid UTF-16LE strings."""
-    strings = []
-    offset = start
+def _iter_strings_in_region(data: bytes, start: int, end: int):
+    """Yield (offset, string) for valid UTF-16LE strings in a region, in order."""
+    next_offset = start
 
-    while offset < end - 4:
+    # Only offsets with a plausible length prefix can start a string; the regex
+    # finds them in one pass so most of the region never reaches Python
+    for match in _LENGTH_PREFIX_RE.finditer(data, start, min(len(data), end - 1)):
+        offset = match.start()
+        if offset < next_offset:
+            continue  # inside a string already read
         s, consumed = read_utf16le_string(data, offset)
         if s and len(s) >= 2:
-            strings.append((offset, s))
-            offset += consumed
-        else:
-            offset += 1
-
-    return strings
+            yield offset, s
+            next_offset = offset + consumed
 
 
 def classify_string(s: str) -> str | None:
     """Classify a string as name, author, version, category, or description."""
-    # Version pattern
-    if re.match(r'^\d+\.\d+\.\d+(\.\d+)?$', s):
-        return 'version'
+    # Version pattern, or short codes to skip (P79, W06, etc.)
+    match = _CLASSIFY_RE.match(s)
+    if match:
+        return 'version' if match.lastgroup == 'version' else None
 
     # Author patterns
-    author_keywords = ['Audio', 'Sound', 'Instruments', 'Productions', 'Music',
-                       'Studios', 'Labs', 'Samples', 'Orchestra']
-    if any(kw in s for kw in author_keywords) and len(s) < 50:
+    if len(s) < 50 and _AUTHOR_RE.search(s):
         return 'author'
 
     # Category patterns
-    category_keywords = ['Strings', 'Bass', 'Piano', 'Synth', 'Pad', 'Lead',
-                         'Brass', 'Woodwind', 'Percussion', 'Drums', 'Guitar',
-                         'Vocal', 'Choir', 'Orchestral', 'Ethnic', 'World']
-    if any(kw in s for kw in category_keywords) and len(s) < 30:
+    if len(s) < 30 and _CATEGORY_RE.search(s):
         return 'category'
 
     # Description pattern
@@ -102,41 +123,24 @@ def classify_string(s: str) -> str | None:
         return 'description'
 
     # Technical/internal strings to skip
-    skip_patterns = ['Kontakt', 'KontaktInstrument', '@', 'DSIN', 'hsin', '4KIN']
-    if any(p in s for p in skip_patterns):
-        return None
-
-    # Short codes to skip
-    if re.match(r'^[A-Z]\d{2}$', s):  # P79, W06, etc.
+    if _SKIP_RE.search(s):
         return None
 
     return 'name'
 
 
-def parse_nki(filepath: Path) -> NKIMetadata:
-    """Parse an NKI file and extract metadata."""
-    meta = NKIMetadata(path=filepath)
-
-    try:
-        data = filepath.read_bytes()
-    except IOError:
-        return meta
-
-    if len(data) < 0x300:
-        return meta
-
+def _scan_metadata(data, meta: NKIMetadata) -> None:
+    """Fill meta from the header region of an NKI (bytes or mmap)."""
     # Look for version around 0x180
-    strings_version = find_strings_in_region(data, 0x160, 0x200)
-    for _, s in strings_version:
-        if re.match(r'^\d+\.\d+\.\d+(\.\d+)?$', s):
+    for _, s in _iter_strings_in_region(data, 0x160, 0x200):
+        match = _CLASSIFY_RE.match(s)
+        if match and match.lastgroup == 'version':
             meta.version = s
             break
 
-    # Look for metadata in 0x200-0x400 region
-    strings_meta = find_strings_in_region(data, 0x200, 0x600)
-
+    # Look for metadata in 0x200-0x400 region; stop once every field is filled
     categories = []
-    for _, s in strings_meta:
+    for _, s in _iter_strings_in_region(data, 0x200, 0x600):
         classification = classify_string(s)
         if classification == 'name' and not meta.name:
             meta.name = s
@@ -147,9 +151,29 @@ def parse_nki(filepath: Path) -> NKIMetadata:
         elif classification == 'description' and not meta.description:
             meta.description = s
 
+        if meta.name and meta.author and meta.description and len(categories) >= 3:
+            break
+
     if categories:
         meta.categories = categories
 
+
+def parse_nki(filepath: Path) -> NKIMetadata:
+    """Parse an NKI file and extract metadata."""
+    meta = NKIMetadata(path=filepath)
+
+    try:
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < 0x300:
+                return meta
+
+            # Only the header is scanned, so map a bounded window instead of reading the whole file
+            with mmap.mmap(f.fileno(), min(size, _SCAN_LIMIT), access=mmap.ACCESS_READ) as data:
+                _scan_metadata(data, meta)
+    except OSError:
+        return meta
+
     # Fallback: use filename as name
     if not meta.name:
         meta.name = filepath.stem
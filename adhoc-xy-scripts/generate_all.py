@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Generate every XY part in one run.
+
+Writes all .abc files first, then converts them with abc2midi concurrently so
+the process spawns overlap instead of running one script at a time.
+
+Needs abc_assembler on the path: pip install -e adhoc-midi-scripts
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from abc_assembler import abc_to_midi, write_abc
+
+from generate_mtron_bass import generate_bass_line
+from generate_part2 import generate_bass_part2, generate_guitar_part2
+from generate_picked_test import generate_test_melody
+
+
+# Output files live next to this script
+_OUT = Path(__file__).resolve().parent
+
+# (name, generator, expected bars); None skips validation like generate_picked_test
+PARTS = [
+    ('mtron-bass', generate_bass_line, 8),
+    ('picked-acoustic-part2', generate_guitar_part2, 8),
+    ('mtron-bass-part2', generate_bass_part2, 8),
+    ('picked-acoustic-test', generate_test_melody, None),
+]
+
+
+def _convert(abc_path: Path) -> str:
+    """Run abc2midi on one file and describe the outcome."""
+    try:
+        return f"  -> {abc_to_midi(abc_path)}"
+    except Exception as e:
+        return f"  {abc_path.name} MIDI error: {e}"
+
+
+def main():
+    abc_paths = []
+    for name, generate, expected_bars in PARTS:
+        abc_path = _OUT / f'{name}.abc'
+        if write_abc(name, generate(), abc_path, expected_bars):
+            abc_paths.append(abc_path)
+
+    # abc2midi runs in a subprocess, so threads are enough to overlap the spawns
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for line in executor.map(_convert, abc_paths):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,74 +8,83 @@ Creates an 8-bar Folk/Americana phrase with:
 - Bar-validated ABC notation
 """
 
+import os
 import sys
-sys.path.insert(0, '/Users/bedwards/halcyon-rift/adhoc-midi-scripts')
 
-from abc_assembler import ABCHeader, generate_abc_header, abc_to_midi
+from abc_assembler import ABCHeader, generate_abc_header, abc_to_midi, write_ascii
+from abc_constants import CC1
+from functools import lru_cache
 from pathlib import Path
 
 
-def generate_test_melody():
-    """Generate the 8-bar Folk/Americana test melody."""
+# Output files live next to this script
+_OUT = Path(__file__).resolve().parent
+_ABC_PATH = _OUT / 'picked-acoustic-test.abc'
+
+# Echo the generated ABC only when HALCYON_VERBOSE is set
+_VERBOSE = bool(os.environ.get('HALCYON_VERBOSE'))
 
-    # Header for Picked Acoustic test
-    header = ABCHeader(
-        title="Picked Acoustic XY Test",
-        meter="4/4",
-        unit_length="1/8",
-        tempo=None,  # No tempo in MIDI - set via OSC/transport
-        key="Am",  # Folk/Americana in A minor
-        midi_program=25,  # Acoustic Guitar (steel) - Kontakt will override
-        midi_channel=1,
-    )
-
-    # Build the ABC content
-    # NOTE: No blank lines between header and music - abc2midi treats blank as end-of-tune
-    # NOTE: Comments become MIDI text events - avoid them to keep output clean
-    # NOTE: %%MIDI control must be inline with music to get correct timing
-    lines = [generate_abc_header(header)]
+
+# ABC content after the header. Joined once at import; CC1 directives are shared interned strings.
+# NOTE: No blank lines between header and music - abc2midi treats blank as end-of-tune
+# NOTE: Comments become MIDI text events - avoid them to keep output clean
+# NOTE: %%MIDI control must be inline with music to get correct timing
+_MELODY_BODY = "\n".join((
     # Disable auto-generated chord accompaniment and bass
-    lines.append("%%MIDI gchordoff")
-    lines.append("%%MIDI bassprog 0")
-    lines.append("%%MIDI chordprog 0")
+    "%%MIDI gchordoff",
+    "%%MIDI bassprog 0",
+    "%%MIDI chordprog 0",
 
     # No keyswitches - XY Instrument sends same MIDI to all chains
     # Each Kontakt instance should be pre-configured to its articulation
 
     # Bars 1-2: Fingerpicked (Am - G) - CC1=20 light vibrato
-    lines.append("%%MIDI control 1 20")
-    lines.append('A,EAc eAEA | G,DGB dBDG |')
+    CC1[20],
+    "A,EAc eAEA | G,DGB dBDG |",
 
     # Bars 3-4: Rhythmic (F - E) - CC1=0 no vibrato
-    lines.append("%%MIDI control 1 0")
-    lines.append('F,2F,2 F,2F,2 | E,2E,2 E,2E,2 |')
+    CC1[0],
+    "F,2F,2 F,2F,2 | E,2E,2 E,2E,2 |",
 
     # Bars 5-6: Strummed chords (Am - C - G - D) - CC1=30 moderate vibrato
-    lines.append("%%MIDI control 1 30")
-    lines.append('[A,CE]4 [CEG]4 | [G,BD]4 [DFA]4 |')
+    CC1[30],
+    "[A,CE]4 [CEG]4 | [G,BD]4 [DFA]4 |",
 
     # Bars 7-8: High melody - CC1=60 expressive vibrato
-    lines.append("%%MIDI control 1 60")
-    lines.append('e4 a4 | e\'8 |')
+    CC1[60],
+    "e4 a4 | e'8 |",
+))
 
-    return '\n'.join(lines)
 
+# Header for Picked Acoustic test
+_MELODY_HEADER = ABCHeader(
+    title="Picked Acoustic XY Test",
+    meter="4/4",
+    unit_length="1/8",
+    tempo=None,  # No tempo in MIDI - set via OSC/transport
+    key="Am",  # Folk/Americana in A minor
+    midi_program=25,  # Acoustic Guitar (steel) - Kontakt will override
+    midi_channel=1,
+)
 
-def main():
-    output_dir = Path('/Users/bedwards/halcyon-rift/adhoc-xy-scripts')
 
+@lru_cache(maxsize=1)
+def generate_test_melody():
+    """Generate the 8-bar Folk/Americana test melody."""
+    return f"{generate_abc_header(_MELODY_HEADER)}\n{_MELODY_BODY}"
+
+
+def main():
     # Generate ABC content
     abc_content = generate_test_melody()
 
     # Write ABC file
-    abc_path = output_dir / 'picked-acoustic-test.abc'
-    abc_path.write_text(abc_content)
-    print(f"Generated ABC file: {abc_path}")
-    print()
-    print("=" * 60)
-    print(abc_content)
-    print("=" * 60)
-    print()
+    write_ascii(_ABC_PATH, abc_content)
+    if _VERBOSE:
+        rule = "=" * 60
+        sys.stdout.write(f"Generated ABC file: {_ABC_PATH}\n\n{rule}\n{abc_content}\n{rule}\n\n")
+    else:
+        sys.stdout.write(f"Generated ABC file: {_ABC_PATH}\n")
 
     # Validate bar counts for each section manually
     # Total should be 8 bars in 4/4 with L:1/8 = 64 units
@@ -83,7 +92,7 @@ def main():
 
     # Try to convert to MIDI
     try:
-        midi_path = abc_to_midi(abc_path)
+        midi_path = abc_to_midi(_ABC_PATH)
         print(f"MIDI generated: {midi_path}")
     except FileNotFoundError:
         print("abc2midi not found - install with: brew install abcmidi")